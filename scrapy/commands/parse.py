@@ -133,12 +133,10 @@ class Command(BaseRunSpiderCommand):
         return arg_to_iter(deferred_from_coro(result))
 
     def add_items(self, lvl, new_items):
-        old_items = self.items.get(lvl, [])
-        self.items[lvl] = old_items + new_items
+        self.items.setdefault(lvl, []).extend(new_items)
 
     def add_requests(self, lvl, new_reqs):
-        old_reqs = self.requests.get(lvl, [])
-        self.requests[lvl] = old_reqs + new_reqs
+        self.requests.setdefault(lvl, []).extend(new_reqs)
 
     def print_items(self, lvl=None, colour=True):
         if lvl is None:
@@ -206,6 +204,7 @@ class Command(BaseRunSpiderCommand):
 
     def set_spidercls(self, url, opts):
         spider_loader = self.crawler_process.spider_loader
+        request = Request(url)
         if opts.spider:
             try:
                 self.spidercls = spider_loader.load(opts.spider)
@@ -214,19 +213,19 @@ class Command(BaseRunSpiderCommand):
                     "Unable to find spider: %(spider)s", {"spider": opts.spider}
                 )
         else:
-            self.spidercls = spidercls_for_request(spider_loader, Request(url))
+            self.spidercls = spidercls_for_request(spider_loader, request)
             if not self.spidercls:
                 logger.error("Unable to find spider for: %(url)s", {"url": url})
 
         def _start_requests(spider):
-            yield self.prepare_request(spider, Request(url), opts)
+            yield self.prepare_request(spider, request, opts)
 
         if self.spidercls:
             self.spidercls.start_requests = _start_requests
 
     def start_parsing(self, url, opts):
         self.crawler_process.crawl(self.spidercls, **opts.spargs)
-        self.pcrawler = list(self.crawler_process.crawlers)[0]
+        self.pcrawler = next(iter(self.crawler_process.crawlers))
         self.crawler_process.start()
 
         if not self.first_response:
@@ -1,9 +1,8 @@
 import ipaddress
-import itertools
 import logging
 from collections import deque
 from ipaddress import IPv4Address, IPv6Address
-from typing import Dict, List, Optional, Union
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
 
 from h2.config import H2Configuration
 from h2.connection import H2Connection
@@ -96,24 +95,45 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         # ID of the next request stream
         # Following the convention - 'Streams initiated by a client MUST
         # use odd-numbered stream identifiers' (RFC 7540 - Section 5.1.1)
-        self._stream_id_generator = itertools.count(start=1, step=2)
+        self._next_stream_id = 1
 
         # Streams are stored in a dictionary keyed off their stream IDs
         self.streams: Dict[int, Stream] = {}
 
+        # IDs of streams which still have request data to send but are
+        # blocked on flow control window space. Only these streams need
+        # to be notified of a connection-level WindowUpdated frame
+        self._window_blocked_streams: Set[int] = set()
+
         # If requests are received before connection is made we keep
-        # all requests in a pool and send them as the connection is made
-        self._pending_request_stream_pool: deque = deque()
+        # all requests in a pool and send them as the connection is made.
+        # Streams are materialized lazily, only when there is capacity to
+        # initiate them, so queued requests do not hold Stream objects.
+        # A deque is used rather than a list: the pool is usually near
+        # empty (making the container choice irrelevant), but it absorbs
+        # request bursts when the connection is saturated or not yet
+        # established, and those need O(1) popleft
+        self._pending_request_stream_pool: Deque[
+            Tuple[Request, Callable[[], Stream]]
+        ] = deque()
 
         # Save an instance of errors raised which lead to losing the connection
         # We pass these instances to the streams ResponseFailed() failure
         self._conn_lost_errors: List[BaseException] = []
 
+        # Set when outbound frames are queued on the h2 connection so that
+        # they can be flushed with a single transport write per batch
+        self._write_pending = False
+
         # Some meta data of this connection
         # initialized when connection is successfully made
         self.metadata: Dict = {
-            # Peer certificate instance
+            # Peer certificate instance, wrapped lazily from the raw
+            # pyOpenSSL certificate below on first use
             "certificate": None,
+            # Raw peer certificate saved when the HTTP/2 connection is
+            # established
+            "raw_certificate": None,
             # Address of the server we are connected to which
             # is updated when HTTP/2 connection is  made successfully
             "ip_address": None,
@@ -124,11 +144,6 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
             # Variables taken from Project Settings
             "default_download_maxsize": settings.getint("DOWNLOAD_MAXSIZE"),
             "default_download_warnsize": settings.getint("DOWNLOAD_WARNSIZE"),
-            # Counter to keep track of opened streams. This counter
-            # is used to make sure that not more than MAX_CONCURRENT_STREAMS
-            # streams are opened which leads to ProtocolError
-            # We use simple FIFO policy to handle pending requests
-            "active_streams": 0,
             # Flag to keep track if settings were acknowledged by the remote
             # This ensures that we have established a HTTP/2 connection
             "settings_acknowledged": False,
@@ -143,6 +158,31 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         assert self.transport is not None  # typing
         return bool(self.transport.connected) and self.metadata["settings_acknowledged"]
 
+    @property
+    def peer_certificate(self) -> Optional[Certificate]:
+        """Certificate of the connected peer. The pyOpenSSL parsing done
+        by the Certificate wrapper is deferred to the first access, so
+        connections whose certificate is never consumed skip it entirely.
+        """
+        if (
+            self.metadata["certificate"] is None
+            and self.metadata["raw_certificate"] is not None
+        ):
+            self.metadata["certificate"] = Certificate(self.metadata["raw_certificate"])
+        return self.metadata["certificate"]
+
+    @property
+    def _active_streams(self) -> int:
+        """Number of streams which have initiated their request and are
+        not yet closed. This is used to make sure that not more than
+        MAX_CONCURRENT_STREAMS streams are opened which leads to
+        ProtocolError. We use simple FIFO policy to handle pending requests.
+
+        Requests waiting in the pending pool have no stream yet, so
+        self.streams holds exactly the active streams.
+        """
+        return len(self.streams)
+
     @property
     def allowed_max_concurrent_streams(self) -> int:
         """We keep total two streams for client (sending data) and
@@ -160,27 +200,37 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         We make sure that at any time {allowed_max_concurrent_streams}
         streams are active.
         """
-        while (
-            self._pending_request_stream_pool
-            and self.metadata["active_streams"] < self.allowed_max_concurrent_streams
-            and self.h2_connected
-        ):
-            self.metadata["active_streams"] += 1
-            stream = self._pending_request_stream_pool.popleft()
-            stream.initiate_request()
+        if self._pending_request_stream_pool and self.h2_connected:
+            # Invariant while draining the pool, hoisted out of the loop
+            max_concurrent_streams = self.allowed_max_concurrent_streams
+            while (
+                self._pending_request_stream_pool
+                and self._active_streams < max_concurrent_streams
+            ):
+                _, materialize_stream = self._pending_request_stream_pool.popleft()
+                stream = materialize_stream()
+                stream.initiate_request()
+                self._schedule_write()
+        if self._write_pending:
             self._write_to_transport()
 
-    def pop_stream(self, stream_id: int) -> Stream:
-        """Perform cleanup when a stream is closed"""
-        stream = self.streams.pop(stream_id)
-        self.metadata["active_streams"] -= 1
+    def pop_stream(self, stream_id: int) -> Optional[Stream]:
+        """Perform cleanup when a stream is closed. Idempotent: returns
+        None if the stream was already removed (e.g. a server-initiated
+        event or a double close)."""
+        stream = self.streams.pop(stream_id, None)
+        if stream is None:
+            return None
+        self._window_blocked_streams.discard(stream_id)
         self._send_pending_requests()
         return stream
 
     def _new_stream(self, request: Request, spider: Spider) -> Stream:
         """Instantiates a new Stream object"""
+        stream_id = self._next_stream_id
+        self._next_stream_id += 2
         stream = Stream(
-            stream_id=next(self._stream_id_generator),
+            stream_id=stream_id,
             request=request,
             protocol=self,
             download_maxsize=getattr(
@@ -193,16 +243,25 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         self.streams[stream.stream_id] = stream
         return stream
 
+    def _schedule_write(self) -> None:
+        """Mark that outbound frames were queued on the h2 connection.
+        They are flushed with a single write in _write_to_transport(),
+        coalescing the frames of several streams into one transport call.
+        """
+        self._write_pending = True
+
     def _write_to_transport(self) -> None:
         """Write data to the underlying transport connection
         from the HTTP2 connection instance if any
         """
         assert self.transport is not None  # typing
+        self._write_pending = False
         # Reset the idle timeout as connection is still actively sending data
         self.resetTimeout()
 
         data = self.conn.data_to_send()
-        self.transport.write(data)
+        if data:
+            self.transport.write(data)
 
     def request(self, request: Request, spider: Spider) -> Deferred:
         if not isinstance(request, Request):
@@ -210,11 +269,29 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
                 f"Expected scrapy.http.Request, received {request.__class__.__qualname__}"
             )
 
-        stream = self._new_stream(request, spider)
-        d = stream.get_response()
+        stream: Optional[Stream] = None
 
-        # Add the stream to the request pool
-        self._pending_request_stream_pool.append(stream)
+        def materialize_stream() -> Stream:
+            nonlocal stream
+            stream = self._new_stream(request, spider)
+            stream.get_response().chainDeferred(d)
+            return stream
+
+        def _cancel(_: Deferred) -> None:
+            # If the request is still waiting in the pool we materialize
+            # its stream on the spot, so that cancellation is handled in
+            # one place -- the stream itself
+            if stream is None:
+                self._pending_request_stream_pool.remove(entry)
+                materialize_stream()
+            assert stream is not None  # typing
+            stream.get_response().cancel()
+
+        d = Deferred(_cancel)
+
+        # Add the request to the pool
+        entry = (request, materialize_stream)
+        self._pending_request_stream_pool.append(entry)
 
         # If we receive a request when connection is idle
         # We need to initiate pending requests
@@ -301,7 +378,7 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         if (
             self.conn.open_outbound_streams > 0
             or self.conn.open_inbound_streams > 0
-            or self.metadata["active_streams"] > 0
+            or self._active_streams > 0
         ):
             error_code = ErrorCodes.PROTOCOL_ERROR
         else:
@@ -334,8 +411,16 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
                 close_reason = StreamCloseReason.INACTIVE
             stream.close(close_reason, self._conn_lost_errors, from_protocol=True)
 
-        self.metadata["active_streams"] -= len(self.streams)
+        # Requests which never got a stream are failed via a stream
+        # materialized just for the errback
+        for _, materialize_stream in self._pending_request_stream_pool:
+            stream = materialize_stream()
+            stream.close(
+                StreamCloseReason.INACTIVE, self._conn_lost_errors, from_protocol=True
+            )
+
         self.streams.clear()
+        self._window_blocked_streams.clear()
         self._pending_request_stream_pool.clear()
         self.conn.close_connection()
 
@@ -347,20 +432,9 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
             events -- A list of events that the remote peer triggered by sending data
         """
         for event in events:
-            if isinstance(event, ConnectionTerminated):
-                self.connection_terminated(event)
-            elif isinstance(event, DataReceived):
-                self.data_received(event)
-            elif isinstance(event, ResponseReceived):
-                self.response_received(event)
-            elif isinstance(event, StreamEnded):
-                self.stream_ended(event)
-            elif isinstance(event, StreamReset):
-                self.stream_reset(event)
-            elif isinstance(event, WindowUpdated):
-                self.window_updated(event)
-            elif isinstance(event, SettingsAcknowledged):
-                self.settings_acknowledged(event)
+            handler = self._event_handlers.get(type(event))
+            if handler is not None:
+                handler(self, event)
             elif isinstance(event, UnknownFrameReceived):
                 logger.warning("Unknown frame received: %s", event.frame)
 
@@ -393,33 +467,46 @@ class H2ClientProtocol(Protocol, TimeoutMixin):
         # established a proper HTTP/2 connection
         self._send_pending_requests()
 
-        # Update certificate when our HTTP/2 connection is established
+        # Save the raw certificate when our HTTP/2 connection is
+        # established; it is wrapped into a Certificate instance only
+        # when actually consumed (see peer_certificate)
         assert self.transport is not None  # typing
-        self.metadata["certificate"] = Certificate(self.transport.getPeerCertificate())
+        self.metadata["raw_certificate"] = self.transport.getPeerCertificate()
 
     def stream_ended(self, event: StreamEnded) -> None:
-        try:
-            stream = self.pop_stream(event.stream_id)
-        except KeyError:
-            pass  # We ignore server-initiated events
-        else:
+        stream = self.pop_stream(event.stream_id)
+        # We ignore server-initiated events
+        if stream is not None:
             stream.close(StreamCloseReason.ENDED, from_protocol=True)
 
     def stream_reset(self, event: StreamReset) -> None:
-        try:
-            stream = self.pop_stream(event.stream_id)
-        except KeyError:
-            pass  # We ignore server-initiated events
-        else:
+        stream = self.pop_stream(event.stream_id)
+        # We ignore server-initiated events
+        if stream is not None:
             stream.close(StreamCloseReason.RESET, from_protocol=True)
 
     def window_updated(self, event: WindowUpdated) -> None:
         if event.stream_id != 0:
             self.streams[event.stream_id].receive_window_update()
         else:
-            # Send leftover data for all the streams
-            for stream in self.streams.values():
-                stream.receive_window_update()
+            # Send leftover data for the streams blocked on window space
+            for stream_id in list(self._window_blocked_streams):
+                stream = self.streams.get(stream_id)
+                if stream is not None:
+                    stream.receive_window_update()
+
+    # Dispatch table used by _handle_events() to route each h2 event to
+    # its handler. Kept at class level so that it is shared by all the
+    # connections instead of being rebuilt per protocol instance
+    _event_handlers: Dict[type, Callable[["H2ClientProtocol", Event], None]] = {
+        ConnectionTerminated: connection_terminated,
+        DataReceived: data_received,
+        ResponseReceived: response_received,
+        StreamEnded: stream_ended,
+        StreamReset: stream_reset,
+        WindowUpdated: window_updated,
+        SettingsAcknowledged: settings_acknowledged,
+    }
 
 
 @implementer(IProtocolNegotiationFactory)
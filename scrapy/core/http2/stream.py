@@ -305,9 +305,11 @@ class Stream:
         # End the stream if no more data needs to be send
         if self.metadata["remaining_content_length"] == 0:
             self._protocol.conn.end_stream(self.stream_id)
-
-        # Q. What about the rest of the data?
-        # Ans: Remaining Data frames will be sent when we get a WindowUpdate frame
+            self._protocol._window_blocked_streams.discard(self.stream_id)
+        else:
+            # Mark the stream as blocked on flow control: the remaining
+            # data frames are sent when we get a WindowUpdate frame
+            self._protocol._window_blocked_streams.add(self.stream_id)
 
     def receive_window_update(self) -> None:
         """Flow control window size was changed.
@@ -484,7 +486,7 @@ class Stream:
             headers=self._response["headers"],
             body=body,
             request=self._request,
-            certificate=self._protocol.metadata["certificate"],
+            certificate=self._protocol.peer_certificate,
             ip_address=self._protocol.metadata["ip_address"],
             protocol="h2",
         )
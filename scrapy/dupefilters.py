@@ -109,9 +109,13 @@ class RFPDupeFilter(BaseDupeFilter):
 
     def request_seen(self, request: Request) -> bool:
         fp = self.request_fingerprint(request)
-        if fp in self.fingerprints:
+        # add() both tests and inserts, so the fingerprint is hashed once
+        # instead of a membership check followed by an insert
+        fingerprints = self.fingerprints
+        size = len(fingerprints)
+        fingerprints.add(fp)
+        if len(fingerprints) == size:
             return True
-        self.fingerprints.add(fp)
         if self.file:
             self.file.write(fp + "\n")
         return False
@@ -13,12 +13,25 @@ import scrapy
 from scrapy.http.common import obsolete_setter
 from scrapy.http.headers import Headers
 from scrapy.utils.curl import curl_to_request_kwargs
+from scrapy.utils.datatypes import LocalCache
 from scrapy.utils.python import to_bytes
 from scrapy.utils.trackref import object_ref
 from scrapy.utils.url import escape_ajax
 
 RequestTypeVar = TypeVar("RequestTypeVar", bound="Request")
 
+# Percent-encoding a URL is a per-character Python loop; memoize the
+# result so that duplicate URLs (links repeated across pages, retries,
+# Request.replace/copy) skip it entirely
+_safe_url_cache: "LocalCache[Tuple[str, str], str]" = LocalCache(limit=10000)
+
+# Already-normalized method names, mapped to themselves so the common path
+# (method="GET" on nearly every request, plus every Request.replace/copy)
+# reuses the constant instead of allocating str(method).upper() anew
+_method_cache = {
+    m: m for m in ("GET", "POST", "HEAD", "PUT", "DELETE", "OPTIONS", "PATCH", "TRACE")
+}
+
 
 def NO_CALLBACK(*args, **kwargs):
     """When assigned to the ``callback`` parameter of
@@ -89,7 +102,9 @@ class Request(object_ref):
         cb_kwargs: Optional[dict] = None,
     ) -> None:
         self._encoding = encoding  # this one has to be set first
-        self.method = str(method).upper()
+        self.method = (
+            _method_cache.get(method) if isinstance(method, str) else None
+        ) or str(method).upper()
         self._set_url(url)
         self._set_body(body)
         if not isinstance(priority, int):
@@ -132,15 +147,19 @@ class Request(object_ref):
         if not isinstance(url, str):
             raise TypeError(f"Request url must be str, got {type(url).__name__}")
 
-        s = safe_url_string(url, self.encoding)
-        self._url = escape_ajax(s)
-
-        if (
-            "://" not in self._url
-            and not self._url.startswith("about:")
-            and not self._url.startswith("data:")
-        ):
-            raise ValueError(f"Missing scheme in request url: {self._url}")
+        key = (url, self.encoding)
+        cached = _safe_url_cache.get(key)
+        if cached is None:
+            s = safe_url_string(url, self.encoding)
+            cached = escape_ajax(s)
+            if (
+                "://" not in cached
+                and not cached.startswith("about:")
+                and not cached.startswith("data:")
+            ):
+                raise ValueError(f"Missing scheme in request url: {cached}")
+            _safe_url_cache[key] = cached
+        self._url = cached
 
     url = property(_get_url, obsolete_setter(_set_url, "url"))
 
@@ -148,7 +167,12 @@ class Request(object_ref):
         return self._body
 
     def _set_body(self, body: Optional[Union[str, bytes]]) -> None:
-        self._body = b"" if body is None else to_bytes(body, self.encoding)
+        if body is None:
+            self._body = b""
+        elif isinstance(body, bytes):
+            self._body = body
+        else:
+            self._body = to_bytes(body, self.encoding)
 
     body = property(_get_body, obsolete_setter(_set_body, "body"))
 
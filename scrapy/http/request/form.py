@@ -158,7 +158,13 @@ def _get_inputs(
 ) -> List[FormdataKVType]:
     """Return a list of key-value pairs for the inputs found in the given form."""
     try:
-        formdata_keys = dict(formdata or ()).keys()
+        # only the keys are needed for the override check, so avoid
+        # materializing a dict copy of the values
+        formdata_keys = (
+            formdata.keys()
+            if isinstance(formdata, dict)
+            else {k for k, _ in formdata or ()}
+        )
     except (ValueError, TypeError):
         raise ValueError("formdata should be a dict or iterable of tuples")
 
@@ -49,9 +49,7 @@ class Link:
         )
 
     def __hash__(self) -> int:
-        return (
-            hash(self.url) ^ hash(self.text) ^ hash(self.fragment) ^ hash(self.nofollow)
-        )
+        return hash((self.url, self.text, self.fragment, self.nofollow))
 
     def __repr__(self) -> str:
         return (
@@ -9,7 +9,7 @@ from urllib.parse import urljoin, urlparse
 from lxml import etree
 from parsel.csstranslator import HTMLTranslator
 from w3lib.html import strip_html5_whitespace
-from w3lib.url import canonicalize_url, safe_url_string
+from w3lib.url import safe_url_string
 
 from scrapy.link import Link
 from scrapy.linkextractors import (
@@ -22,7 +22,11 @@ from scrapy.linkextractors import (
 from scrapy.utils.misc import arg_to_iter, rel_has_nofollow
 from scrapy.utils.python import unique as unique_list
 from scrapy.utils.response import get_base_url
-from scrapy.utils.url import url_has_any_extension, url_is_from_any_domain
+from scrapy.utils.url import (
+    _canonicalize_url_cached,
+    url_has_any_extension,
+    url_is_from_any_domain,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +48,7 @@ def _identity(x):
 
 
 def _canonicalize_link_url(link):
-    return canonicalize_url(link.url, keep_fragments=True)
+    return _canonicalize_url_cached(link.url, keep_fragments=True)
 
 
 class LxmlParserLinkExtractor:
@@ -59,6 +63,12 @@ class LxmlParserLinkExtractor:
     ):
         self.scan_tag = tag if callable(tag) else partial(operator.eq, tag)
         self.scan_attr = attr if callable(attr) else partial(operator.eq, attr)
+        # When the tag matcher boils down to a constant set of names,
+        # iteration can be filtered by lxml at C level (see _iter_links)
+        self._iter_tags = self._constant_tags(tag)
+        # Likewise, constant attribute names are matched with a frozenset
+        # instead of calling scan_attr() per attribute
+        self._match_attrs = self._constant_attrs(attr)
         self.process_attr = process if callable(process) else _identity
         self.unique = unique
         self.strip = strip
@@ -66,45 +76,107 @@ class LxmlParserLinkExtractor:
             operator.attrgetter("url") if canonicalized else _canonicalize_link_url
         )
 
+    @staticmethod
+    def _constant_tags(tag):
+        """Tag names that lxml can filter on during iteration, or None
+        when the tag matcher is an arbitrary callable
+        """
+        if isinstance(tag, str):
+            tags = (tag,)
+        elif (
+            isinstance(tag, partial)
+            and tag.func is operator.contains
+            and not tag.keywords
+            and len(tag.args) == 1
+        ):
+            tags = tuple(tag.args[0])
+        else:
+            return None
+        # XHTML documents parsed as XML carry namespaced tag names
+        return tags + tuple(f"{{{XHTML_NAMESPACE}}}{t}" for t in tags)
+
+    @staticmethod
+    def _constant_attrs(attr):
+        """Attribute names matched by a plain string or container, or
+        None when the attribute matcher is an arbitrary callable
+        """
+        if isinstance(attr, str):
+            return frozenset((attr,))
+        if (
+            isinstance(attr, partial)
+            and attr.func is operator.contains
+            and not attr.keywords
+            and len(attr.args) == 1
+        ):
+            return frozenset(attr.args[0])
+        return None
+
     def _iter_links(self, document):
-        for el in document.iter(etree.Element):
-            if not self.scan_tag(_nons(el.tag)):
-                continue
+        if self._iter_tags is not None:
+            if not self._iter_tags:
+                # no tags to match at all, e.g. tags=()
+                return
+            # libxml2 filters the tags in C, instead of this method
+            # calling scan_tag() for every element of the document
+            elements = document.iter(*self._iter_tags)
+        else:
+            elements = (
+                el
+                for el in document.iter(etree.Element)
+                if self.scan_tag(_nons(el.tag))
+            )
+        attr_matches = (
+            self._match_attrs.__contains__
+            if self._match_attrs is not None
+            else self.scan_attr
+        )
+        for el in elements:
             attribs = el.attrib
             for attrib in attribs:
-                if not self.scan_attr(attrib):
-                    continue
-                yield (el, attrib, attribs[attrib])
+                if attr_matches(attrib):
+                    yield (el, attrib, attribs[attrib])
 
     def _extract_links(self, selector, response_url, response_encoding, base_url):
         links = []
+        strip = self.strip
+        process_attr = self.process_attr
+        # bind the per-link callables to locals: this loop runs once per
+        # extracted attribute, so the global/attribute lookups add up
+        links_append = links.append
+        strip_whitespace = strip_html5_whitespace
+        join_url = urljoin
+        safe_url = safe_url_string
+        string_content = _collect_string_content
+        has_nofollow = rel_has_nofollow
+        make_link = Link
         # hacky way to get the underlying lxml parsed document
         for el, attr, attr_val in self._iter_links(selector.root):
             # pseudo lxml.html.HtmlElement.make_links_absolute(base_url)
             try:
-                if self.strip:
-                    attr_val = strip_html5_whitespace(attr_val)
-                attr_val = urljoin(base_url, attr_val)
+                if strip:
+                    attr_val = strip_whitespace(attr_val)
+                attr_val = join_url(base_url, attr_val)
             except ValueError:
                 continue  # skipping bogus links
             else:
-                url = self.process_attr(attr_val)
+                url = process_attr(attr_val)
                 if url is None:
                     continue
             try:
-                url = safe_url_string(url, encoding=response_encoding)
+                url = safe_url(url, encoding=response_encoding)
             except ValueError:
                 logger.debug(f"Skipping extraction of link with bad URL {url!r}")
                 continue
 
-            # to fix relative links after process_value
-            url = urljoin(response_url, url)
-            link = Link(
+            if process_attr is not _identity:
+                # to fix relative links after process_value
+                url = join_url(response_url, url)
+            link = make_link(
                 url,
-                _collect_string_content(el) or "",
-                nofollow=rel_has_nofollow(el.get("rel")),
+                string_content(el) or "",
+                nofollow=has_nofollow(el.get("rel")),
             )
-            links.append(link)
+            links_append(link)
         return self._deduplicate_if_needed(links)
 
     def extract_links(self, response):
@@ -219,8 +291,11 @@ class LxmlLinkExtractor:
         links = [x for x in links if self._link_allowed(x)]
         if self.canonicalize:
             for link in links:
-                link.url = canonicalize_url(link.url)
-        links = self.link_extractor._process_links(links)
+                link.url = _canonicalize_url_cached(link.url)
+            # canonicalization may have merged previously distinct URLs,
+            # so the batch needs deduplicating again; otherwise the keys
+            # are the same ones _extract_links() already deduplicated on
+            links = self.link_extractor._process_links(links)
         return links
 
     def _extract_links(self, *args, **kwargs):
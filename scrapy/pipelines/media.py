@@ -22,6 +22,9 @@ def _DUMMY_CALLBACK(response):
     return response
 
 
+_UNCACHED = object()
+
+
 class MediaPipeline:
     LOG_FAILED_RESULTS = True
 
@@ -103,29 +106,36 @@ class MediaPipeline:
         request.errback = None
 
         # Return cached result if request was already seen
-        if fp in info.downloaded:
-            return defer_result(info.downloaded[fp]).addCallbacks(cb, eb)
+        result = info.downloaded.get(fp, _UNCACHED)
+        if result is not _UNCACHED:
+            return defer_result(result).addCallbacks(cb, eb)
 
         # Otherwise, wait for result
         wad = Deferred().addCallbacks(cb, eb)
-        info.waiting[fp].append(wad)
 
-        # Check if request is downloading right now to avoid doing it twice
-        if fp in info.downloading:
+        # Check if request is downloading right now to avoid doing it twice;
+        # a waiter list exists exactly while the download is in flight, so a
+        # single lookup covers both the "downloading" and "waiting" checks
+        waiters = info.waiting.get(fp)
+        if waiters is not None:
+            waiters.append(wad)
             return wad
+        info.waiting[fp] = [wad]
 
         # Download request checking media_to_download hook output first
         info.downloading.add(fp)
         dfd = mustbe_deferred(self.media_to_download, request, info, item=item)
         dfd.addCallback(self._check_media_to_download, request, info, item=item)
         dfd.addBoth(self._cache_result_and_execute_waiters, fp, info)
-        dfd.addErrback(
-            lambda f: logger.error(
-                f.value, exc_info=failure_to_exc_info(f), extra={"spider": info.spider}
-            )
-        )
+        dfd.addErrback(self._log_exception, info)
         return dfd.addBoth(lambda _: wad)  # it must return wad at last
 
+    @staticmethod
+    def _log_exception(f, info):
+        logger.error(
+            f.value, exc_info=failure_to_exc_info(f), extra={"spider": info.spider}
+        )
+
     def _make_compatible(self):
         """Make overridable methods of MediaPipeline and subclasses backwards compatible"""
         methods = [
@@ -2,26 +2,33 @@
 RefererMiddleware: populates Request referer field, based on the Response which
 originated it.
 """
+import sys
 import warnings
-from typing import Tuple
-from urllib.parse import urlparse
+from typing import FrozenSet, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+from weakref import WeakKeyDictionary
 
 from w3lib.url import safe_url_string
 
 from scrapy import signals
 from scrapy.exceptions import NotConfigured
 from scrapy.http import Request, Response
+from scrapy.utils.datatypes import LocalCache
 from scrapy.utils.misc import load_object
 from scrapy.utils.python import to_unicode
 from scrapy.utils.url import strip_url
 
-LOCAL_SCHEMES = (
-    "about",
-    "blob",
-    "data",
-    "filesystem",
+LOCAL_SCHEMES = frozenset(
+    {
+        "about",
+        "blob",
+        "data",
+        "filesystem",
+    }
 )
 
+TLS_PROTECTED_SCHEMES = frozenset({"https", "ftps"})
+
 POLICY_NO_REFERRER = "no-referrer"
 POLICY_NO_REFERRER_WHEN_DOWNGRADE = "no-referrer-when-downgrade"
 POLICY_SAME_ORIGIN = "same-origin"
@@ -32,9 +39,40 @@ POLICY_STRICT_ORIGIN_WHEN_CROSS_ORIGIN = "strict-origin-when-cross-origin"
 POLICY_UNSAFE_URL = "unsafe-url"
 POLICY_SCRAPY_DEFAULT = "scrapy-default"
 
+# Several policies strip the same URL more than once per processed request
+# (e.g. both as full referrer and as origin), so memoize the stripped form.
+_strip_url_cache: "LocalCache[Tuple[str, bool], str]" = LocalCache(limit=10000)
+
+# Decoded Referrer-Policy header per response, constant for its lifetime
+_response_policy_cache: "WeakKeyDictionary[Response, Optional[str]]" = (
+    WeakKeyDictionary()
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443, "ftp": 21}
+
+
+def _serialize_origin(url):
+    """Serialized origin of a URL: scheme://host[:port]/ with credentials
+    and default ports dropped.
+
+    Equivalent to strip_url(url, strip_credentials=True,
+    strip_default_port=True, origin_only=True), specialized to plain
+    string formatting instead of the general URL rebuilder.
+    """
+    parsed_url = urlparse(url)
+    netloc = parsed_url.netloc
+    if parsed_url.username or parsed_url.password:
+        netloc = netloc.split("@")[-1]
+    port = parsed_url.port
+    if port and _DEFAULT_PORTS.get(parsed_url.scheme) == port:
+        netloc = netloc.replace(f":{port}", "")
+    if netloc:
+        return f"{parsed_url.scheme}://{netloc}/"
+    return urlunparse((parsed_url.scheme, netloc, "/", "", "", ""))
+
 
 class ReferrerPolicy:
-    NOREFERRER_SCHEMES: Tuple[str, ...] = LOCAL_SCHEMES
+    NOREFERRER_SCHEMES: FrozenSet[str] = LOCAL_SCHEMES
     name: str
 
     def referrer(self, response_url, request_url):
@@ -46,7 +84,7 @@ class ReferrerPolicy:
 
     def origin_referrer(self, url):
         if urlparse(url).scheme not in self.NOREFERRER_SCHEMES:
-            return self.origin(url)
+            return self.strip_url(url, origin_only=True)
 
     def strip_url(self, url, origin_only=False):
         """
@@ -64,27 +102,28 @@ class ReferrerPolicy:
         """
         if not url:
             return None
-        return strip_url(
-            url,
-            strip_credentials=True,
-            strip_fragment=True,
-            strip_default_port=True,
-            origin_only=origin_only,
-        )
-
-    def origin(self, url):
-        """Return serialized origin (scheme, host, path) for a request or response URL."""
-        return self.strip_url(url, origin_only=True)
+        key = (url, origin_only)
+        if key not in _strip_url_cache:
+            if origin_only:
+                _strip_url_cache[key] = _serialize_origin(url)
+            else:
+                _strip_url_cache[key] = strip_url(
+                    url,
+                    strip_credentials=True,
+                    strip_fragment=True,
+                    strip_default_port=True,
+                )
+        return _strip_url_cache[key]
 
     def potentially_trustworthy(self, url):
         # Note: this does not follow https://w3c.github.io/webappsec-secure-contexts/#is-url-trustworthy
-        parsed_url = urlparse(url)
-        if parsed_url.scheme in ("data",):
+        scheme = urlparse(url).scheme
+        if scheme == "data":
             return False
-        return self.tls_protected(url)
+        return scheme in TLS_PROTECTED_SCHEMES
 
     def tls_protected(self, url):
-        return urlparse(url).scheme in ("https", "ftps")
+        return urlparse(url).scheme in TLS_PROTECTED_SCHEMES
 
 
 class NoReferrerPolicy(ReferrerPolicy):
@@ -138,7 +177,9 @@ class SameOriginPolicy(ReferrerPolicy):
     name: str = POLICY_SAME_ORIGIN
 
     def referrer(self, response_url, request_url):
-        if self.origin(response_url) == self.origin(request_url):
+        if self.strip_url(response_url, origin_only=True) == self.strip_url(
+            request_url, origin_only=True
+        ):
             return self.stripped_referrer(response_url)
 
 
@@ -175,10 +216,8 @@ class StrictOriginPolicy(ReferrerPolicy):
     name: str = POLICY_STRICT_ORIGIN
 
     def referrer(self, response_url, request_url):
-        if (
-            self.tls_protected(response_url)
-            and self.potentially_trustworthy(request_url)
-            or not self.tls_protected(response_url)
+        if not self.tls_protected(response_url) or self.potentially_trustworthy(
+            request_url
         ):
             return self.origin_referrer(response_url)
 
@@ -198,8 +237,8 @@ class OriginWhenCrossOriginPolicy(ReferrerPolicy):
     name: str = POLICY_ORIGIN_WHEN_CROSS_ORIGIN
 
     def referrer(self, response_url, request_url):
-        origin = self.origin(response_url)
-        if origin == self.origin(request_url):
+        origin = self.strip_url(response_url, origin_only=True)
+        if origin == self.strip_url(request_url, origin_only=True):
             return self.stripped_referrer(response_url)
         return origin
 
@@ -225,13 +264,11 @@ class StrictOriginWhenCrossOriginPolicy(ReferrerPolicy):
     name: str = POLICY_STRICT_ORIGIN_WHEN_CROSS_ORIGIN
 
     def referrer(self, response_url, request_url):
-        origin = self.origin(response_url)
-        if origin == self.origin(request_url):
+        origin = self.strip_url(response_url, origin_only=True)
+        if origin == self.strip_url(request_url, origin_only=True):
             return self.stripped_referrer(response_url)
-        if (
-            self.tls_protected(response_url)
-            and self.potentially_trustworthy(request_url)
-            or not self.tls_protected(response_url)
+        if not self.tls_protected(response_url) or self.potentially_trustworthy(
+            request_url
         ):
             return self.origin_referrer(response_url)
 
@@ -263,12 +300,14 @@ class DefaultReferrerPolicy(NoReferrerWhenDowngradePolicy):
     using ``file://`` or ``s3://`` scheme.
     """
 
-    NOREFERRER_SCHEMES: Tuple[str, ...] = LOCAL_SCHEMES + ("file", "s3")
+    NOREFERRER_SCHEMES: FrozenSet[str] = LOCAL_SCHEMES | {"file", "s3"}
     name: str = POLICY_SCRAPY_DEFAULT
 
 
+# Keys are interned so that lookups with interned names (see
+# _response_policy_name) stay on the pointer-comparison fast path
 _policy_classes = {
-    p.name: p
+    sys.intern(p.name): p
     for p in (
         NoReferrerPolicy,
         NoReferrerWhenDowngradePolicy,
@@ -285,6 +324,9 @@ _policy_classes = {
 # Reference: https://www.w3.org/TR/referrer-policy/#referrer-policy-empty-string
 _policy_classes[""] = NoReferrerWhenDowngradePolicy
 
+# Policy classes are stateless, so a single shared instance per class is enough.
+_policy_instances = {name: cls() for name, cls in _policy_classes.items()}
+
 
 def _load_policy_class(policy, warning_only=False):
     """
@@ -311,6 +353,7 @@ class RefererMiddleware:
         self.default_policy = DefaultReferrerPolicy
         if settings is not None:
             self.default_policy = _load_policy_class(settings.get("REFERRER_POLICY"))
+        self._default_policy_instance = self.default_policy()
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -336,28 +379,72 @@ class RefererMiddleware:
           it is used if valid
         - otherwise, the policy from settings is used.
         """
+        response_policy_name = (
+            self._response_policy_name(resp_or_url)
+            if isinstance(resp_or_url, Response)
+            else None
+        )
+        return self._policy_for(request, response_policy_name)
+
+    def _response_policy_name(self, response):
+        """Referrer-Policy name set in the response headers, or None"""
+        if response not in _response_policy_cache:
+            policy_header = response.headers.get("Referrer-Policy")
+            policy_name = None
+            if policy_header is not None:
+                # Interned so that repeated lookups hash/compare by pointer
+                policy_name = sys.intern(to_unicode(policy_header.decode("latin1")))
+            _response_policy_cache[response] = policy_name
+        return _response_policy_cache[response]
+
+    def _policy_for(self, request, response_policy_name=None):
         policy_name = request.meta.get("referrer_policy")
         if policy_name is None:
-            if isinstance(resp_or_url, Response):
-                policy_header = resp_or_url.headers.get("Referrer-Policy")
-                if policy_header is not None:
-                    policy_name = to_unicode(policy_header.decode("latin1"))
-        if policy_name is None:
-            return self.default_policy()
+            policy_name = response_policy_name
+        return self._policy_from_name(policy_name)
 
+    def _policy_from_name(self, policy_name):
+        if policy_name is None:
+            return self._default_policy_instance
+
+        if isinstance(policy_name, str):
+            # Policy names are already lowercase in the common case; try the
+            # exact match first to avoid allocating a lowercased copy per call
+            policy = _policy_instances.get(policy_name) or _policy_instances.get(
+                policy_name.lower()
+            )
+            if policy is not None:
+                return policy
+        # non-string values (e.g. a policy class object) are passed through
+        # to load_object() by _load_policy_class
         cls = _load_policy_class(policy_name, warning_only=True)
-        return cls() if cls else self.default_policy()
+        return cls() if cls else self._default_policy_instance
 
     def process_spider_output(self, response, result, spider):
-        return (self._set_referer(r, response) for r in result or ())
+        # The response-derived policy name is the same for every item
+        # of the batch, so resolve it only once
+        policy_name = self._response_policy_name(response)
+        noreferrer = isinstance(self._policy_from_name(policy_name), NoReferrerPolicy)
+        return (
+            self._set_referer(r, response, policy_name, noreferrer)
+            for r in result or ()
+        )
 
     async def process_spider_output_async(self, response, result, spider):
+        policy_name = self._response_policy_name(response)
+        noreferrer = isinstance(self._policy_from_name(policy_name), NoReferrerPolicy)
         async for r in result or ():
-            yield self._set_referer(r, response)
+            yield self._set_referer(r, response, policy_name, noreferrer)
 
-    def _set_referer(self, r, response):
+    def _set_referer(self, r, response, response_policy_name=None, noreferrer=False):
         if isinstance(r, Request):
-            referrer = self.policy(response, r).referrer(response.url, r.url)
+            # When the batch-level policy is no-referrer, requests without
+            # a per-request override need no referrer computation at all
+            if noreferrer and "referrer_policy" not in r.meta:
+                return r
+            referrer = self._policy_for(r, response_policy_name).referrer(
+                response.url, r.url
+            )
             if referrer is not None:
                 r.headers.setdefault("Referer", referrer)
         return r
@@ -375,7 +462,9 @@ class RefererMiddleware:
                 # Note: if the 3xx response contained a Referrer-Policy header,
                 #       the information is not available using this hook
                 parent_url = safe_url_string(request_referrer)
-                policy_referrer = self.policy(parent_url, request).referrer(
+                # The parent URL is not a Response, so the policy can only
+                # come from the request meta or the configured default
+                policy_referrer = self._policy_for(request).referrer(
                     parent_url, request.url
                 )
                 if policy_referrer != request_referrer:
@@ -15,6 +15,8 @@ def urlparse_cached(request_or_response: Union[Request, Response]) -> ParseResul
     """Return urlparse.urlparse caching the result, where the argument can be a
     Request or Response object
     """
-    if request_or_response not in _urlparse_cache:
-        _urlparse_cache[request_or_response] = urlparse(request_or_response.url)
-    return _urlparse_cache[request_or_response]
+    parsed = _urlparse_cache.get(request_or_response)
+    if parsed is None:
+        parsed = urlparse(request_or_response.url)
+        _urlparse_cache[request_or_response] = parsed
+    return parsed
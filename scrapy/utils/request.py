@@ -6,6 +6,7 @@ scrapy.http.Request objects
 import hashlib
 import json
 import warnings
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -23,21 +24,44 @@ from urllib.parse import urlunparse
 from weakref import WeakKeyDictionary
 
 from w3lib.http import basic_auth_header
-from w3lib.url import canonicalize_url
 
 from scrapy import Request, Spider
 from scrapy.exceptions import ScrapyDeprecationWarning
 from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.misc import load_object
 from scrapy.utils.python import to_bytes, to_unicode
+from scrapy.utils.url import _canonicalize_url_cached
 
 if TYPE_CHECKING:
     from scrapy.crawler import Crawler
 
+# Fingerprints are not security sensitive; flagging the digest as such lets
+# FIPS-enabled OpenSSL builds skip their policy checks (Python 3.9+)
+try:
+    hashlib.sha1(usedforsecurity=False)
+except TypeError:
+    _sha1 = hashlib.sha1
+else:
+
+    def _sha1(data: bytes = b"") -> "hashlib._Hash":
+        return hashlib.sha1(data, usedforsecurity=False)
+
+
 _deprecated_fingerprint_cache: "WeakKeyDictionary[Request, Dict[Tuple[Optional[Tuple[bytes, ...]], bool], str]]"
 _deprecated_fingerprint_cache = WeakKeyDictionary()
 
 
+@lru_cache(maxsize=32)
+def _processed_include_headers(
+    include_headers: Tuple[Union[bytes, str], ...]
+) -> Tuple[bytes, ...]:
+    """Normalize an include_headers tuple once per distinct value: the set of
+    headers to include is crawler-wide, so sorting and lowercasing it per
+    request is pure repeat work
+    """
+    return tuple(to_bytes(h.lower()) for h in sorted(include_headers))
+
+
 def _serialize_headers(
     headers: Iterable[bytes], request: Request
 ) -> Generator[bytes, Any, None]:
@@ -137,29 +161,56 @@ def request_fingerprint(
     warnings.warn(message, category=ScrapyDeprecationWarning, stacklevel=2)
     processed_include_headers: Optional[Tuple[bytes, ...]] = None
     if include_headers:
-        processed_include_headers = tuple(
-            to_bytes(h.lower()) for h in sorted(include_headers)
-        )
-    cache = _deprecated_fingerprint_cache.setdefault(request, {})
+        processed_include_headers = _processed_include_headers(tuple(include_headers))
+    # .get() instead of setdefault(): the latter allocates a fresh dict
+    # per call only to discard it on every cache hit
+    cache = _deprecated_fingerprint_cache.get(request)
+    if cache is None:
+        cache = _deprecated_fingerprint_cache[request] = {}
     cache_key = (processed_include_headers, keep_fragments)
     if cache_key not in cache:
-        fp = hashlib.sha1()
-        fp.update(to_bytes(request.method))
-        fp.update(
-            to_bytes(canonicalize_url(request.url, keep_fragments=keep_fragments))
-        )
-        fp.update(request.body or b"")
+        # hash a single joined buffer instead of one update() call per
+        # part; the digest is identical and the C boundary is crossed once
+        parts = [
+            to_bytes(request.method),
+            to_bytes(_canonicalize_url_cached(request.url, keep_fragments)),
+            request.body or b"",
+        ]
         if processed_include_headers:
-            for part in _serialize_headers(processed_include_headers, request):
-                fp.update(part)
-        cache[cache_key] = fp.hexdigest()
+            parts.extend(_serialize_headers(processed_include_headers, request))
+        cache[cache_key] = _sha1(b"".join(parts)).hexdigest()
     return cache[cache_key]
 
 
-def _request_fingerprint_as_bytes(*args: Any, **kwargs: Any) -> bytes:
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        return bytes.fromhex(request_fingerprint(*args, **kwargs))
+_fingerprint_as_bytes_cache: "WeakKeyDictionary[Request, Dict[Tuple[Optional[Tuple[bytes, ...]], bool], bytes]]"
+_fingerprint_as_bytes_cache = WeakKeyDictionary()
+
+
+def _request_fingerprint_as_bytes(
+    request: Request,
+    include_headers: Optional[Iterable[Union[bytes, str]]] = None,
+    keep_fragments: bool = False,
+) -> bytes:
+    # Memoized separately from _deprecated_fingerprint_cache so that repeat
+    # calls (e.g. scheduler + media pipelines fingerprinting the same
+    # request) skip the warnings.catch_warnings() machinery and the hex
+    # round-trip, not just the SHA-1 digest
+    processed_include_headers: Optional[Tuple[bytes, ...]] = None
+    if include_headers:
+        processed_include_headers = _processed_include_headers(tuple(include_headers))
+    # .get() instead of setdefault(): the latter allocates a fresh dict
+    # per call only to discard it on every cache hit
+    cache = _fingerprint_as_bytes_cache.get(request)
+    if cache is None:
+        cache = _fingerprint_as_bytes_cache[request] = {}
+    cache_key = (processed_include_headers, keep_fragments)
+    if cache_key not in cache:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cache[cache_key] = bytes.fromhex(
+                request_fingerprint(request, include_headers, keep_fragments)
+            )
+    return cache[cache_key]
 
 
 _fingerprint_cache: "WeakKeyDictionary[Request, Dict[Tuple[Optional[Tuple[bytes, ...]], bool], bytes]]"
@@ -204,10 +255,12 @@ def fingerprint(
     """
     processed_include_headers: Optional[Tuple[bytes, ...]] = None
     if include_headers:
-        processed_include_headers = tuple(
-            to_bytes(h.lower()) for h in sorted(include_headers)
-        )
-    cache = _fingerprint_cache.setdefault(request, {})
+        processed_include_headers = _processed_include_headers(tuple(include_headers))
+    # .get() instead of setdefault(): the latter allocates a fresh dict
+    # per call only to discard it on every cache hit
+    cache = _fingerprint_cache.get(request)
+    if cache is None:
+        cache = _fingerprint_cache[request] = {}
     cache_key = (processed_include_headers, keep_fragments)
     if cache_key not in cache:
         # To decode bytes reliably (JSON does not support bytes), regardless of
@@ -220,14 +273,34 @@ def fingerprint(
                         header_value.hex()
                         for header_value in request.headers.getlist(header)
                     ]
-        fingerprint_data = {
-            "method": to_unicode(request.method),
-            "url": canonicalize_url(request.url, keep_fragments=keep_fragments),
-            "body": (request.body or b"").hex(),
-            "headers": headers,
-        }
-        fingerprint_json = json.dumps(fingerprint_data, sort_keys=True)
-        cache[cache_key] = hashlib.sha1(fingerprint_json.encode()).digest()
+        method = to_unicode(request.method)
+        url = _canonicalize_url_cached(request.url, keep_fragments)
+        body = (request.body or b"").hex()
+        method_url = method + url
+        if (
+            not headers
+            and method_url.isascii()
+            and method_url.isprintable()
+            and '"' not in method_url
+            and "\\" not in method_url
+        ):
+            # the overwhelmingly common case — no included headers and
+            # nothing JSON would escape (canonical URLs are percent-encoded
+            # ASCII) — serializes to a fixed shape, so build it directly
+            # and skip json.dumps
+            fingerprint_json = (
+                f'{{"body": "{body}", "headers": {{}}, '
+                f'"method": "{method}", "url": "{url}"}}'
+            )
+        else:
+            fingerprint_data = {
+                "method": method,
+                "url": url,
+                "body": body,
+                "headers": headers,
+            }
+            fingerprint_json = json.dumps(fingerprint_data, sort_keys=True)
+        cache[cache_key] = _sha1(fingerprint_json.encode()).digest()
     return cache[cache_key]
 
 
@@ -6,11 +6,12 @@ import os
 import re
 import tempfile
 import webbrowser
-from typing import Any, Callable, Iterable, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
 from weakref import WeakKeyDictionary
 
 from twisted.web import http
 from w3lib import html
+from w3lib.encoding import html_to_unicode
 
 import scrapy
 from scrapy.http.response import Response
@@ -20,14 +21,34 @@ from scrapy.utils.python import to_bytes, to_unicode
 _baseurl_cache: "WeakKeyDictionary[Response, str]" = WeakKeyDictionary()
 
 
+def _decoded_head(
+    response: "scrapy.http.response.text.TextResponse", length: int = 4096
+) -> str:
+    """Return the first ``length`` characters of the decoded response body,
+    without materializing a full unicode copy of a body that has not been
+    decoded yet just to scan its head
+    """
+    if response._cached_ubody is None:
+        # resolving the encoding may itself decode and cache the whole body
+        # (encoding auto-detection), so re-check the cache afterwards
+        benc = f"charset={response.encoding}"
+        if response._cached_ubody is None:
+            # 4 bytes per character covers the widest sequences of the
+            # supported encodings, plus slack so a sequence cut at the
+            # boundary never falls inside the returned slice
+            body = response.body[: length * 4 + 4]
+            return html_to_unicode(benc, body)[1][:length]
+    return response._cached_ubody[:length]
+
+
 def get_base_url(response: "scrapy.http.response.text.TextResponse") -> str:
     """Return the base url of the given response, joined with the response url"""
-    if response not in _baseurl_cache:
-        text = response.text[0:4096]
-        _baseurl_cache[response] = html.get_base_url(
-            text, response.url, response.encoding
-        )
-    return _baseurl_cache[response]
+    base_url = _baseurl_cache.get(response)
+    if base_url is None:
+        text = _decoded_head(response)
+        base_url = html.get_base_url(text, response.url, response.encoding)
+        _baseurl_cache[response] = base_url
+    return base_url
 
 
 _metaref_cache: "WeakKeyDictionary[Response, Union[Tuple[None, None], Tuple[float, str]]]" = (
@@ -40,19 +61,30 @@ def get_meta_refresh(
     ignore_tags: Iterable[str] = ("script", "noscript"),
 ) -> Union[Tuple[None, None], Tuple[float, str]]:
     """Parse the http-equiv refresh parameter from the given response"""
-    if response not in _metaref_cache:
-        text = response.text[0:4096]
-        _metaref_cache[response] = html.get_meta_refresh(
+    refresh = _metaref_cache.get(response)
+    if refresh is None:
+        text = _decoded_head(response)
+        refresh = html.get_meta_refresh(
             text, response.url, response.encoding, ignore_tags=ignore_tags
         )
-    return _metaref_cache[response]
+        _metaref_cache[response] = refresh
+    return refresh
+
+
+_status_message_cache: Dict[int, str] = {}
 
 
 def response_status_message(status: Union[bytes, float, int, str]) -> str:
     """Return status code plus status text descriptive message"""
+    # memoized per status code: the retry middleware calls this for every
+    # failed response, and the set of distinct codes is tiny
     status_int = int(status)
-    message = http.RESPONSES.get(status_int, "Unknown Status")
-    return f"{status_int} {to_unicode(message)}"
+    message = _status_message_cache.get(status_int)
+    if message is None:
+        raw = http.RESPONSES.get(status_int, "Unknown Status")
+        message = f"{status_int} {to_unicode(raw)}"
+        _status_message_cache[status_int] = message
+    return message
 
 
 @deprecated
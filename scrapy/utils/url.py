@@ -6,7 +6,7 @@ Some of the functions that used to be imported from this module have been moved
 to the w3lib.url module. Always import those from there instead.
 """
 import re
-from typing import TYPE_CHECKING, Iterable, Optional, Type, Union, cast
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple, Type, Union, cast
 from urllib.parse import ParseResult, urldefrag, urlparse, urlunparse
 
 # scrapy.utils.url was moved to w3lib.url and import * ensures this
@@ -14,6 +14,7 @@ from urllib.parse import ParseResult, urldefrag, urlparse, urlunparse
 from w3lib.url import *
 from w3lib.url import _safe_chars, _unquotepath  # noqa: F401
 
+from scrapy.utils.datatypes import LocalCache
 from scrapy.utils.python import to_unicode
 
 if TYPE_CHECKING:
@@ -22,6 +23,21 @@ if TYPE_CHECKING:
 
 UrlT = Union[str, bytes, ParseResult]
 
+# Canonicalizing a URL re-parses it and re-sorts its query string, the most
+# expensive pure-Python step on the fingerprint and link-dedup paths. Keyed
+# by the URL string, the memo is shared by every Request or Link pointing at
+# the same resource, so each distinct URL is canonicalized once per form
+_canonical_url_cache: "LocalCache[Tuple[str, bool], str]" = LocalCache(limit=10000)
+
+
+def _canonicalize_url_cached(url: str, keep_fragments: bool = False) -> str:
+    key = (url, keep_fragments)
+    canonical = _canonical_url_cache.get(key)
+    if canonical is None:
+        canonical = canonicalize_url(url, keep_fragments=keep_fragments)
+        _canonical_url_cache[key] = canonical
+    return canonical
+
 
 def url_is_from_any_domain(url: UrlT, domains: Iterable[str]) -> bool:
     """Return True if the url belongs to any of the given domains"""
@@ -5,7 +5,6 @@ import shutil
 import sys
 import tempfile
 import unittest
-from io import StringIO
 from pathlib import Path
 from subprocess import PIPE, Popen
 
@@ -41,13 +40,14 @@ class CmdlineTest(unittest.TestCase):
         try:
             self._execute("version", "--profile", str(filename))
             self.assertTrue(filename.exists())
-            out = StringIO()
-            stats = pstats.Stats(str(filename), stream=out)
-            stats.print_stats()
-            out.seek(0)
-            stats = out.read()
-            self.assertIn(str(Path("scrapy", "commands", "version.py")), stats)
-            self.assertIn("tottime", stats)
+            # check the stats table directly instead of formatting the
+            # whole print_stats() report just to search it for a substring
+            stats = pstats.Stats(str(filename))
+            self.assertTrue(stats.stats)
+            expected = str(Path("scrapy", "commands", "version.py"))
+            self.assertTrue(
+                any(expected in func_path for func_path, _, _ in stats.stats)
+            )
         finally:
             shutil.rmtree(path)
 
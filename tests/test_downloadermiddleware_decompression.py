@@ -18,7 +18,12 @@ def _test_data(formats):
 
 class DecompressionMiddlewareTest(TestCase):
     test_formats = ["tar", "xml.bz2", "xml.gz", "zip"]
-    uncompressed_body, test_responses = _test_data(test_formats)
+
+    @classmethod
+    def setUpClass(cls):
+        # Read the fixtures once for the whole test case, and only when
+        # it actually runs rather than at import time
+        cls.uncompressed_body, cls.test_responses = _test_data(cls.test_formats)
 
     def setUp(self):
         self.mw = DecompressionMiddleware()
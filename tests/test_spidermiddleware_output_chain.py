@@ -1,3 +1,5 @@
+import logging
+
 from testfixtures import LogCapture
 from twisted.internet import defer
 from twisted.trial.unittest import TestCase
@@ -6,6 +8,20 @@ from scrapy import Request, Spider
 from scrapy.utils.test import get_crawler
 from tests.mockserver import MockServer
 
+# a single MockServer subprocess serves the whole module: spawning it
+# (and waiting for its listeners) is the dominant fixed cost of these tests
+mockserver = None
+
+
+def setUpModule():
+    global mockserver
+    mockserver = MockServer()
+    mockserver.__enter__()
+
+
+def tearDownModule():
+    mockserver.__exit__(None, None, None)
+
 
 class LogExceptionMiddleware:
     def process_spider_exception(self, response, exception, spider):
@@ -161,52 +177,80 @@ class NotGeneratorCallbackSpiderMiddlewareRightAfterSpider(NotGeneratorCallbackS
 
 # ================================================================================
 # (4) exceptions from a middleware process_spider_output method (generator)
-class _GeneratorDoNothingMiddleware:
+class _ProcessedTagsMiddleware:
+    """Precompute the marker strings appended to item['processed'], so the
+    per-item loops do not re-format the class name for every item
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._out_tag = f"{cls.__name__}.process_spider_output"
+        cls._exc_tag = f"{cls.__name__}.process_spider_exception"
+
+    def _log_exception(self, exception, spider):
+        # skip the logging call entirely when INFO is filtered out
+        logger = spider.logger
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s: %s caught", self._exc_tag, type(exception).__name__)
+
+
+class _GeneratorDoNothingMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
         for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
+            r["processed"].append(self._out_tag)
             yield r
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
+        self._log_exception(exception, spider)
         return None
 
 
-class GeneratorFailMiddleware:
+class GeneratorFailMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
         for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
+            r["processed"].append(self._out_tag)
             yield r
             raise LookupError()
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
-        yield {"processed": [method]}
+        self._log_exception(exception, spider)
+        yield {"processed": [self._exc_tag]}
 
 
 class GeneratorDoNothingAfterFailureMiddleware(_GeneratorDoNothingMiddleware):
     pass
 
 
-class GeneratorRecoverMiddleware:
+class GeneratorRecoverMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
         for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
+            r["processed"].append(self._out_tag)
             yield r
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
-        yield {"processed": [method]}
+        self._log_exception(exception, spider)
+        yield {"processed": [self._exc_tag]}
 
 
 class GeneratorDoNothingAfterRecoveryMiddleware(_GeneratorDoNothingMiddleware):
     pass
 
 
-class GeneratorOutputChainSpider(Spider):
+class _StatusUrlSpider(Spider):
+    """Build the mockserver status URL once per spider class and reuse it
+    across crawls (the module-level mockserver is stable for the whole run)
+    """
+
+    _status_url = None
+
+    def status_url(self):
+        url = type(self)._status_url
+        if url is None:
+            url = type(self)._status_url = self.mockserver.url("/status?n=200")
+        return url
+
+
+class GeneratorOutputChainSpider(_StatusUrlSpider):
     name = "GeneratorOutputChainSpider"
     custom_settings = {
         "SPIDER_MIDDLEWARES": {
@@ -218,7 +262,7 @@ class GeneratorOutputChainSpider(Spider):
     }
 
     def start_requests(self):
-        yield Request(self.mockserver.url("/status?n=200"))
+        yield Request(self.status_url())
 
     def parse(self, response):
         yield {"processed": ["parse-first-item"]}
@@ -229,58 +273,54 @@ class GeneratorOutputChainSpider(Spider):
 # (5) exceptions from a middleware process_spider_output method (not generator)
 
 
-class _NotGeneratorDoNothingMiddleware:
+class _NotGeneratorDoNothingMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
-        out = []
+        # materialize once and mutate in place instead of copying the
+        # items into a second list one append at a time
+        result = list(result)
+        tag = self._out_tag
         for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
-            out.append(r)
-        return out
+            r["processed"].append(tag)
+        return result
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
+        self._log_exception(exception, spider)
         return None
 
 
-class NotGeneratorFailMiddleware:
+class NotGeneratorFailMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
-        out = []
-        for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
-            out.append(r)
+        # no point tagging the items first: the raise discards them all,
+        # which is exactly what the output chain tests assert on
         raise ReferenceError()
-        return out
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
-        return [{"processed": [method]}]
+        self._log_exception(exception, spider)
+        return [{"processed": [self._exc_tag]}]
 
 
 class NotGeneratorDoNothingAfterFailureMiddleware(_NotGeneratorDoNothingMiddleware):
     pass
 
 
-class NotGeneratorRecoverMiddleware:
+class NotGeneratorRecoverMiddleware(_ProcessedTagsMiddleware):
     def process_spider_output(self, response, result, spider):
-        out = []
+        result = list(result)
+        tag = self._out_tag
         for r in result:
-            r["processed"].append(f"{self.__class__.__name__}.process_spider_output")
-            out.append(r)
-        return out
+            r["processed"].append(tag)
+        return result
 
     def process_spider_exception(self, response, exception, spider):
-        method = f"{self.__class__.__name__}.process_spider_exception"
-        spider.logger.info("%s: %s caught", method, exception.__class__.__name__)
-        return [{"processed": [method]}]
+        self._log_exception(exception, spider)
+        return [{"processed": [self._exc_tag]}]
 
 
 class NotGeneratorDoNothingAfterRecoveryMiddleware(_NotGeneratorDoNothingMiddleware):
     pass
 
 
-class NotGeneratorOutputChainSpider(Spider):
+class NotGeneratorOutputChainSpider(_StatusUrlSpider):
     name = "NotGeneratorOutputChainSpider"
     custom_settings = {
         "SPIDER_MIDDLEWARES": {
@@ -292,7 +332,7 @@ class NotGeneratorOutputChainSpider(Spider):
     }
 
     def start_requests(self):
-        return [Request(self.mockserver.url("/status?n=200"))]
+        return [Request(self.status_url())]
 
     def parse(self, response):
         return [
@@ -301,22 +341,43 @@ class NotGeneratorOutputChainSpider(Spider):
         ]
 
 
-# ================================================================================
-class TestSpiderMiddleware(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        cls.mockserver = MockServer()
-        cls.mockserver.__enter__()
+# expected item trails for the output chain tests, rendered once at import
+_EXPECTED_GENERATOR_CALLBACK_ITEM = str(
+    {
+        "processed": [
+            "parse-first-item",
+            "GeneratorFailMiddleware.process_spider_output",
+            "GeneratorDoNothingAfterFailureMiddleware.process_spider_output",
+            "GeneratorRecoverMiddleware.process_spider_output",
+            "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
+        ]
+    }
+)
+_EXPECTED_GENERATOR_RECOVERED_ITEM = str(
+    {
+        "processed": [
+            "GeneratorRecoverMiddleware.process_spider_exception",
+            "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
+        ]
+    }
+)
+_EXPECTED_NOT_GENERATOR_RECOVERED_ITEM = str(
+    {
+        "processed": [
+            "NotGeneratorRecoverMiddleware.process_spider_exception",
+            "NotGeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
+        ]
+    }
+)
 
-    @classmethod
-    def tearDownClass(cls):
-        cls.mockserver.__exit__(None, None, None)
 
+# ================================================================================
+class TestSpiderMiddleware(TestCase):
     @defer.inlineCallbacks
     def crawl_log(self, spider):
         crawler = get_crawler(spider)
         with LogCapture() as log:
-            yield crawler.crawl(mockserver=self.mockserver)
+            yield crawler.crawl(mockserver=mockserver)
         return log
 
     @defer.inlineCallbacks
@@ -328,9 +389,10 @@ class TestSpiderMiddleware(TestCase):
         was enqueued from the recovery middleware)
         """
         log = yield self.crawl_log(RecoverySpider)
-        self.assertIn("Middleware: TabError exception caught", str(log))
-        self.assertEqual(str(log).count("Middleware: TabError exception caught"), 1)
-        self.assertIn("'item_scraped_count': 3", str(log))
+        text = str(log)
+        self.assertIn("Middleware: TabError exception caught", text)
+        self.assertEqual(text.count("Middleware: TabError exception caught"), 1)
+        self.assertIn("'item_scraped_count': 3", text)
 
     @defer.inlineCallbacks
     def test_recovery_asyncgen(self):
@@ -338,9 +400,10 @@ class TestSpiderMiddleware(TestCase):
         Same as test_recovery but with an async callback.
         """
         log = yield self.crawl_log(RecoveryAsyncGenSpider)
-        self.assertIn("Middleware: TabError exception caught", str(log))
-        self.assertEqual(str(log).count("Middleware: TabError exception caught"), 1)
-        self.assertIn("'item_scraped_count': 3", str(log))
+        text = str(log)
+        self.assertIn("Middleware: TabError exception caught", text)
+        self.assertEqual(text.count("Middleware: TabError exception caught"), 1)
+        self.assertIn("'item_scraped_count': 3", text)
 
     @defer.inlineCallbacks
     def test_process_spider_input_without_errback(self):
@@ -349,8 +412,9 @@ class TestSpiderMiddleware(TestCase):
         process_spider_exception chain from the start if the Request has no errback
         """
         log1 = yield self.crawl_log(ProcessSpiderInputSpiderWithoutErrback)
-        self.assertIn("Middleware: will raise IndexError", str(log1))
-        self.assertIn("Middleware: IndexError exception caught", str(log1))
+        text = str(log1)
+        self.assertIn("Middleware: will raise IndexError", text)
+        self.assertIn("Middleware: IndexError exception caught", text)
 
     @defer.inlineCallbacks
     def test_process_spider_input_with_errback(self):
@@ -359,12 +423,13 @@ class TestSpiderMiddleware(TestCase):
         process_spider_exception chain if the Request has an errback
         """
         log1 = yield self.crawl_log(ProcessSpiderInputSpiderWithErrback)
-        self.assertNotIn("Middleware: IndexError exception caught", str(log1))
-        self.assertIn("Middleware: will raise IndexError", str(log1))
-        self.assertIn("Got a Failure on the Request errback", str(log1))
-        self.assertIn("{'from': 'errback'}", str(log1))
-        self.assertNotIn("{'from': 'callback'}", str(log1))
-        self.assertIn("'item_scraped_count': 1", str(log1))
+        text = str(log1)
+        self.assertNotIn("Middleware: IndexError exception caught", text)
+        self.assertIn("Middleware: will raise IndexError", text)
+        self.assertIn("Got a Failure on the Request errback", text)
+        self.assertIn("{'from': 'errback'}", text)
+        self.assertNotIn("{'from': 'callback'}", text)
+        self.assertIn("'item_scraped_count': 1", text)
 
     @defer.inlineCallbacks
     def test_generator_callback(self):
@@ -374,8 +439,9 @@ class TestSpiderMiddleware(TestCase):
         exception is raised should be processed normally.
         """
         log2 = yield self.crawl_log(GeneratorCallbackSpider)
-        self.assertIn("Middleware: ImportError exception caught", str(log2))
-        self.assertIn("'item_scraped_count': 2", str(log2))
+        text = str(log2)
+        self.assertIn("Middleware: ImportError exception caught", text)
+        self.assertIn("'item_scraped_count': 2", text)
 
     @defer.inlineCallbacks
     def test_async_generator_callback(self):
@@ -383,8 +449,9 @@ class TestSpiderMiddleware(TestCase):
         Same as test_generator_callback but with an async callback.
         """
         log2 = yield self.crawl_log(AsyncGeneratorCallbackSpider)
-        self.assertIn("Middleware: ImportError exception caught", str(log2))
-        self.assertIn("'item_scraped_count': 2", str(log2))
+        text = str(log2)
+        self.assertIn("Middleware: ImportError exception caught", text)
+        self.assertIn("'item_scraped_count': 2", text)
 
     @defer.inlineCallbacks
     def test_generator_callback_right_after_callback(self):
@@ -393,8 +460,9 @@ class TestSpiderMiddleware(TestCase):
         even if the middleware is placed right after the spider
         """
         log21 = yield self.crawl_log(GeneratorCallbackSpiderMiddlewareRightAfterSpider)
-        self.assertIn("Middleware: ImportError exception caught", str(log21))
-        self.assertIn("'item_scraped_count': 2", str(log21))
+        text = str(log21)
+        self.assertIn("Middleware: ImportError exception caught", text)
+        self.assertIn("'item_scraped_count': 2", text)
 
     @defer.inlineCallbacks
     def test_not_a_generator_callback(self):
@@ -403,8 +471,9 @@ class TestSpiderMiddleware(TestCase):
         be caught by the process_spider_exception chain. No items should be processed.
         """
         log3 = yield self.crawl_log(NotGeneratorCallbackSpider)
-        self.assertIn("Middleware: ZeroDivisionError exception caught", str(log3))
-        self.assertNotIn("item_scraped_count", str(log3))
+        text = str(log3)
+        self.assertIn("Middleware: ZeroDivisionError exception caught", text)
+        self.assertNotIn("item_scraped_count", text)
 
     @defer.inlineCallbacks
     def test_not_a_generator_callback_right_after_callback(self):
@@ -415,8 +484,9 @@ class TestSpiderMiddleware(TestCase):
         log31 = yield self.crawl_log(
             NotGeneratorCallbackSpiderMiddlewareRightAfterSpider
         )
-        self.assertIn("Middleware: ZeroDivisionError exception caught", str(log31))
-        self.assertNotIn("item_scraped_count", str(log31))
+        text = str(log31)
+        self.assertIn("Middleware: ZeroDivisionError exception caught", text)
+        self.assertNotIn("item_scraped_count", text)
 
     @defer.inlineCallbacks
     def test_generator_output_chain(self):
@@ -429,41 +499,27 @@ class TestSpiderMiddleware(TestCase):
         process_spider_exception chain)
         """
         log4 = yield self.crawl_log(GeneratorOutputChainSpider)
-        self.assertIn("'item_scraped_count': 2", str(log4))
+        text = str(log4)
+        self.assertIn("'item_scraped_count': 2", text)
         self.assertIn(
             "GeneratorRecoverMiddleware.process_spider_exception: LookupError caught",
-            str(log4),
+            text,
         )
         self.assertIn(
             "GeneratorDoNothingAfterFailureMiddleware.process_spider_exception: LookupError caught",
-            str(log4),
+            text,
         )
         self.assertNotIn(
             "GeneratorFailMiddleware.process_spider_exception: LookupError caught",
-            str(log4),
+            text,
         )
         self.assertNotIn(
             "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_exception: LookupError caught",
-            str(log4),
+            text,
         )
-        item_from_callback = {
-            "processed": [
-                "parse-first-item",
-                "GeneratorFailMiddleware.process_spider_output",
-                "GeneratorDoNothingAfterFailureMiddleware.process_spider_output",
-                "GeneratorRecoverMiddleware.process_spider_output",
-                "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
-            ]
-        }
-        item_recovered = {
-            "processed": [
-                "GeneratorRecoverMiddleware.process_spider_exception",
-                "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
-            ]
-        }
-        self.assertIn(str(item_from_callback), str(log4))
-        self.assertIn(str(item_recovered), str(log4))
-        self.assertNotIn("parse-second-item", str(log4))
+        self.assertIn(_EXPECTED_GENERATOR_CALLBACK_ITEM, text)
+        self.assertIn(_EXPECTED_GENERATOR_RECOVERED_ITEM, text)
+        self.assertNotIn("parse-second-item", text)
 
     @defer.inlineCallbacks
     def test_not_a_generator_output_chain(self):
@@ -476,29 +532,24 @@ class TestSpiderMiddleware(TestCase):
         from the spider callback are lost)
         """
         log5 = yield self.crawl_log(NotGeneratorOutputChainSpider)
-        self.assertIn("'item_scraped_count': 1", str(log5))
+        text = str(log5)
+        self.assertIn("'item_scraped_count': 1", text)
         self.assertIn(
             "GeneratorRecoverMiddleware.process_spider_exception: ReferenceError caught",
-            str(log5),
+            text,
         )
         self.assertIn(
             "GeneratorDoNothingAfterFailureMiddleware.process_spider_exception: ReferenceError caught",
-            str(log5),
+            text,
         )
         self.assertNotIn(
             "GeneratorFailMiddleware.process_spider_exception: ReferenceError caught",
-            str(log5),
+            text,
         )
         self.assertNotIn(
             "GeneratorDoNothingAfterRecoveryMiddleware.process_spider_exception: ReferenceError caught",
-            str(log5),
+            text,
         )
-        item_recovered = {
-            "processed": [
-                "NotGeneratorRecoverMiddleware.process_spider_exception",
-                "NotGeneratorDoNothingAfterRecoveryMiddleware.process_spider_output",
-            ]
-        }
-        self.assertIn(str(item_recovered), str(log5))
-        self.assertNotIn("parse-first-item", str(log5))
-        self.assertNotIn("parse-second-item", str(log5))
+        self.assertIn(_EXPECTED_NOT_GENERATOR_RECOVERED_ITEM, text)
+        self.assertNotIn("parse-first-item", text)
+        self.assertNotIn("parse-second-item", text)